@@ -17,6 +17,22 @@ from qiling.arch.models import MIPS_CPU_MODEL
 from qiling.arch.register import QlRegisterManager
 from qiling.const import QL_ARCH, QL_ENDIAN
 
+# fully-combined engine modes per endianess, precomputed at import time
+_UC_MODE = {
+    QL_ENDIAN.EB: UC_MODE_MIPS32 + UC_MODE_BIG_ENDIAN,
+    QL_ENDIAN.EL: UC_MODE_MIPS32 + UC_MODE_LITTLE_ENDIAN
+}
+
+_CS_MODE = {
+    QL_ENDIAN.EB: CS_MODE_MIPS32 + CS_MODE_BIG_ENDIAN,
+    QL_ENDIAN.EL: CS_MODE_MIPS32 + CS_MODE_LITTLE_ENDIAN
+}
+
+_KS_MODE = {
+    QL_ENDIAN.EB: KS_MODE_MIPS32 + KS_MODE_BIG_ENDIAN,
+    QL_ENDIAN.EL: KS_MODE_MIPS32 + KS_MODE_LITTLE_ENDIAN
+}
+
 
 class QlArchMIPS(QlArch):
     type = QL_ARCH.MIPS
@@ -29,12 +45,7 @@ class QlArchMIPS(QlArch):
 
     @cached_property
     def uc(self) -> Uc:
-        endian = {
-            QL_ENDIAN.EB: UC_MODE_BIG_ENDIAN,
-            QL_ENDIAN.EL: UC_MODE_LITTLE_ENDIAN
-        }[self.endian]
-
-        return Uc(UC_ARCH_MIPS, UC_MODE_MIPS32 + endian)
+        return Uc(UC_ARCH_MIPS, _UC_MODE[self.endian])
 
     @cached_property
     def regs(self) -> QlRegisterManager:
@@ -49,21 +60,11 @@ class QlArchMIPS(QlArch):
 
     @cached_property
     def disassembler(self) -> Cs:
-        endian = {
-            QL_ENDIAN.EL: CS_MODE_LITTLE_ENDIAN,
-            QL_ENDIAN.EB: CS_MODE_BIG_ENDIAN
-        }[self.endian]
-
-        return Cs(CS_ARCH_MIPS, CS_MODE_MIPS32 + endian)
+        return Cs(CS_ARCH_MIPS, _CS_MODE[self.endian])
 
     @cached_property
     def assembler(self) -> Ks:
-        endian = {
-            QL_ENDIAN.EL: KS_MODE_LITTLE_ENDIAN,
-            QL_ENDIAN.EB: KS_MODE_BIG_ENDIAN
-        }[self.endian]
-
-        return Ks(KS_ARCH_MIPS, KS_MODE_MIPS32 + endian)
+        return Ks(KS_ARCH_MIPS, _KS_MODE[self.endian])
 
     @property
     def endian(self) -> QL_ENDIAN:
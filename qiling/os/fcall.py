@@ -106,7 +106,15 @@ class QlFunctionCall:
             write(si, val)
             si += nslots
 
-    def __count_slots(self, ptypes: Iterable[Any]) -> int:
+    def countSlots(self, ptypes: Iterable[Any]) -> int:
+        """Count the number of argument slots occupied by a parameters list.
+
+        Args:
+            ptypes: a sequence of parameters types
+
+        Returns: number of occupied slots
+        """
+
         default = self.accessors[PARAM_INTN]
 
         return sum(self.accessors.get(typ, default)[2] for typ in ptypes)
@@ -184,7 +192,7 @@ class QlFunctionCall:
         # arguments they got. since the caller is responsible for unwinding
         # we should be good.
 
-        nslots = self.__count_slots(proto.values())
+        nslots = self.countSlots(proto.values())
         retaddr = -1 if passthru else self.cc.unwind(nslots)
 
         return targs, retval, retaddr
@@ -199,7 +207,7 @@ class QlFunctionCall:
         """
 
         # reserve slots for arguments
-        nslots = self.__count_slots(atype for atype, _ in args)
+        nslots = self.countSlots(atype for atype, _ in args)
         self.cc.reserve(nslots)
 
         if ret is not None:
@@ -386,6 +386,38 @@ class QlMemoryManager:
 
         self.write(addr, __pack(value))
 
+    def write_ptrs(self, addr: int, values: Sequence[Tuple[int, int]]) -> None:
+        """Write a series of contiguous integer values to memory.
+
+        All values are packed into a single buffer which is then written in
+        one go, saving a round-trip to the emulation engine for each value.
+
+        Args:
+            addr: target memory address of the first value
+            values: a sequence of 2-tuples pairing integer values with their
+            sizes (in bytes): either 1, 2, 4, 8, or 0 for arch native size
+        """
+
+        __packers = {
+            1: self.ql.pack8,
+            2: self.ql.pack16,
+            4: self.ql.pack32,
+            8: self.ql.pack64
+        }
+
+        native = self.ql.arch.pointersize
+        buf = bytearray()
+
+        for value, size in values:
+            __pack = __packers.get(size or native)
+
+            if __pack is None:
+                raise QlErrorStructConversion(f"Unsupported pointer size: {size}")
+
+            buf += __pack(value)
+
+        self.write(addr, bytes(buf))
+
     def search(self, needle: Union[bytes, Pattern[bytes]], begin: Optional[int] = None, end: Optional[int] = None) -> List[int]:
         """Search for a sequence of bytes in memory.
 
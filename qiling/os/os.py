@@ -174,11 +174,14 @@ class QlOs:
         names = params.keys()
         types = params.values()
         values = self.fcall.readParams(types)
+        resolvers = self.resolvers
         resolved = {}
 
         for name, typ, val in zip(names, types, values):
-            if typ in self.resolvers:
-                val = self.resolvers[typ](val)
+            resolver = resolvers.get(typ)
+
+            if resolver is not None:
+                val = resolver(val)
 
             resolved[name] = val
 
@@ -221,6 +224,32 @@ class QlOs:
 
         return retval
 
+    def call_stub(self, pc: int, fname: str, proto: Mapping[str, Any], retval: int):
+        """Handle a hooked function that unconditionally returns a constant
+        value, skipping parameters resolution altogether.
+
+        Args:
+            pc: function entry point
+            fname: function name
+            proto: function's parameters types list
+            retval: constant value to return to the caller
+        """
+
+        self.fcall.cc.setReturnValue(retval)
+
+        # honor the calling convention cleanup even though no parameter is read
+        nslots = self.fcall.countSlots(proto.values())
+        retaddr = self.fcall.cc.unwind(nslots)
+
+        self.utils.print_function(pc, fname, (), retval, False)
+        self.stats.log_api_call(pc, fname, {}, retval, retaddr)
+
+        # see the pc modification workaround note in `call`
+        if self.ql.emu_state is not QL_STATE.STOPPED:
+            self.ql.arch.regs.arch_pc = retaddr
+
+        return retval
+
     def set_api(self, target: Union[int, str], handler: Callable, intercept: QL_INTERCEPT = QL_INTERCEPT.CALL):
         """Either hook or replace an OS API with a custom one.
 
@@ -3,35 +3,69 @@
 # Cross Platform and Multi Architecture Advanced Binary Emulation Framework
 #
 
-from typing import Callable, Tuple
+from functools import partial
+from operator import itemgetter
+from typing import Any, Callable, Mapping, Tuple
 
 from qiling import Qiling
 from qiling.os.windows.api import *
 from qiling.os.windows.const import *
 from qiling.os.windows.fncc import *
+from qiling.os.windows.handle import HKEY_ROOTS
 from qiling.os.windows.structs import *
 
+# backslash-terminated prefixes of the registry hive roots, precomputed to
+# avoid re-formatting the full key name on every RegOpenKey / RegCreateKey
+__hkey_prefix = {name: f'{name}\\' for _, name in HKEY_ROOTS}
+
+# AllocateAndInitializeSid sub-authority parameter names, precomputed to avoid
+# formatting them anew on every call
+__subauth_keys = tuple(f'nSubAuthority{i}' for i in range(8))
+
+# pre-bound parameters getters; a single itemgetter call replaces a series of
+# per-key dict lookups on hot registry paths
+__reg_open_args      = itemgetter('hKey', 'lpSubKey', 'phkResult')
+__reg_query_args     = itemgetter('hKey', 'lpValueName', 'lpType', 'lpData', 'lpcbData')
+__reg_setvalue_args  = itemgetter('hKey', 'lpSubKey', 'dwType', 'lpData', 'cbData')
+__reg_setvalex_args  = itemgetter('hKey', 'lpValueName', 'dwType', 'lpData', 'cbData')
+__reg_delkey_args    = itemgetter('hKey', 'lpSubKey')
+__reg_delvalue_args  = itemgetter('hKey', 'lpValueName')
+
+def __make_reg_hook(impl: Callable, name: str, params: Mapping[str, Any], **presets) -> Callable:
+    """Create a named winsdkapi hook bound to a shared implementation.
+
+    A lightweight partial is used so each generated hook carries its own name
+    for logging purposes while sharing the implementation code object. Keyword
+    arguments whose value is fixed per variant (e.g. `wstring`) may be bound
+    in advance through `presets`.
+    """
+
+    hook = partial(impl, **presets)
+    hook.__name__ = name
+
+    return winsdkapi(cc=STDCALL, params=params)(hook)
+
 def __RegOpenKey(ql: Qiling, address: int, params):
-    hKey = params["hKey"]
-    lpSubKey = params["lpSubKey"]
-    phkResult = params["phkResult"]
+    hKey, lpSubKey, phkResult = __reg_open_args(params)
 
-    handle = ql.os.handle_manager.get(hKey)
+    hm = ql.os.handle_manager
+    handle = hm.get(hKey)
 
-    if handle is None or not handle.name.startswith('HKEY'):
+    if handle is None or not handle.is_hkey:
         return ERROR_FILE_NOT_FOUND
 
     params["hKey"] = handle.name
 
     if lpSubKey:
-        key = f'{handle.name}\\{lpSubKey}'
+        key = __hkey_prefix.get(handle.name, f'{handle.name}\\') + lpSubKey
 
-        # Keys in the profile are saved as KEY\PARAM = VALUE, so i just want to check that the key is the same
-        keys_profile = [entry.casefold() for entry in ql.os.profile["REGISTRY"].keys()]
+        # Keys in the profile are saved as KEY\PARAM = VALUE, so i just want to check that the key is the same.
+        # case-fold the key exactly once; a single dict probe yields the key spelling used by the profile
+        profile_key = ql.os.registry_manager.profile_keys_cf.get(key.casefold())
 
-        if key.casefold() in keys_profile:
+        if profile_key is not None:
             ql.log.debug("Using profile for key of  %s" % key)
-            ql.os.registry_manager.access(key)
+            ql.os.registry_manager.access(profile_key)
 
         else:
             if not ql.os.registry_manager.exists(key):
@@ -40,7 +74,7 @@ def __RegOpenKey(ql: Qiling, address: int, params):
 
         # new handle
         handle = Handle(obj=key)
-        ql.os.handle_manager.append(handle)
+        hm.append(handle)
 
     if phkResult:
         ql.mem.write_ptr(phkResult, handle.id)
@@ -50,31 +84,37 @@ def __RegOpenKey(ql: Qiling, address: int, params):
 def __RegQueryValue(ql: Qiling, address: int, params, wstring: bool):
     ret = ERROR_SUCCESS
 
-    hKey = params["hKey"]
-    lpValueName = params["lpValueName"]
-    lpType = params["lpType"]
-    lpData = params["lpData"]
-    lpcbData = params["lpcbData"]
-    s_hKey = ql.os.handle_manager.get(hKey).obj
+    hKey, lpValueName, lpType, lpData, lpcbData = __reg_query_args(params)
+
+    # this helper references several ql.os components more than once; bind
+    # them to locals so each chained attribute walk is done only once
+    os = ql.os
+    rm = os.registry_manager
+    mem = ql.mem
+
+    s_hKey = os.handle_manager.get(hKey).obj
     params["hKey"] = s_hKey
+
+    read_ptr = mem.read_ptr
+
     # read reg_type
-    reg_type = Registry.RegNone if lpType == 0 else ql.mem.read_ptr(lpType, 4)
+    reg_type = Registry.RegNone if lpType == 0 else read_ptr(lpType, 4)
 
     # try reading the registry key value from profile first.
     # if the key is not specified in profile, proceed to registry manager
 
     keyname = f'{s_hKey}\\{lpValueName}'
-    value = ql.os.profile["REGISTRY"].get(keyname)
+    value = rm.regprofile.get(keyname)
 
     if value is None:
-        reg_type, value = ql.os.registry_manager.read(s_hKey, lpValueName, reg_type)
+        reg_type, value = rm.read(s_hKey, lpValueName, reg_type)
 
     else:
         ql.log.debug(f'Value for {keyname} was read from profile')
 
         reg_type = Registry.RegSZ
         # set that the registry has been accessed
-        ql.os.registry_manager.access(s_hKey, lpValueName, reg_type, value)
+        rm.access(s_hKey, lpValueName, reg_type, value)
 
     # error key
     if reg_type is None or value is None:
@@ -83,7 +123,7 @@ def __RegQueryValue(ql: Qiling, address: int, params, wstring: bool):
 
     # read how many bytes we are allowed to write into lpData, however this arg is optional
     if lpcbData:
-        max_size = ql.mem.read_ptr(lpcbData, 4)
+        max_size = read_ptr(lpcbData, 4)
     else:
         max_size = 0
 
@@ -93,11 +133,11 @@ def __RegQueryValue(ql: Qiling, address: int, params, wstring: bool):
             return ERROR_INVALID_PARAMETER
 
     # set lpData
-    length = ql.os.registry_manager.write_reg_value_into_mem(reg_type, lpData, value, max_size, wstring)
+    length = rm.write_reg_value_into_mem(reg_type, lpData, value, max_size, wstring)
 
     # set lpcbData
     if lpcbData:
-        ql.mem.write_ptr(lpcbData, length, 4)
+        mem.write_ptr(lpcbData, length, 4)
 
     if max_size < length:
         ret = ERROR_MORE_DATA
@@ -105,29 +145,28 @@ def __RegQueryValue(ql: Qiling, address: int, params, wstring: bool):
     return ret
 
 def __RegCreateKey(ql: Qiling, address: int, params):
-    hKey = params["hKey"]
-    lpSubKey = params["lpSubKey"]
-    phkResult = params["phkResult"]
+    hKey, lpSubKey, phkResult = __reg_open_args(params)
 
-    handle = ql.os.handle_manager.get(hKey)
+    hm = ql.os.handle_manager
+    handle = hm.get(hKey)
 
-    if handle is None or not handle.name.startswith('HKEY'):
+    if handle is None or not handle.is_hkey:
         return ERROR_FILE_NOT_FOUND
 
     params["hKey"] = handle.name
 
     if lpSubKey:
-        keyname = f'{handle.name}\\{lpSubKey}'
+        keyname = __hkey_prefix.get(handle.name, f'{handle.name}\\') + lpSubKey
 
         if not ql.os.registry_manager.exists(keyname):
             ql.os.registry_manager.create(keyname)
 
-        handle = ql.os.handle_manager.search_by_obj(keyname)
+        handle = hm.search_by_obj(keyname)
 
         # make sure we have a handle for this keyname
         if handle is None:
             handle = Handle(obj=keyname)
-            ql.os.handle_manager.append(handle)
+            hm.append(handle)
 
     if phkResult:
         ql.mem.write_ptr(phkResult, handle.id)
@@ -135,11 +174,7 @@ def __RegCreateKey(ql: Qiling, address: int, params):
     return ERROR_SUCCESS
 
 def __RegSetValue(ql: Qiling, address: int, params, wstring: bool):
-    hKey = params["hKey"]
-    lpSubKey = params["lpSubKey"]
-    dwType = params["dwType"]
-    lpData = params["lpData"]
-    cbData = params["cbData"]
+    hKey, lpSubKey, dwType, lpData, cbData = __reg_setvalue_args(params)
 
     s_hKey = ql.os.handle_manager.get(hKey).obj
     # this is done so the print_function would print the correct value
@@ -154,11 +189,7 @@ def __RegSetValue(ql: Qiling, address: int, params, wstring: bool):
     return ERROR_SUCCESS
 
 def __RegSetValueEx(ql: Qiling, address: int, params, wstring: bool):
-    hKey = params["hKey"]
-    lpValueName = params["lpValueName"]
-    dwType = params["dwType"]
-    lpData = params["lpData"]
-    cbData = params["cbData"]
+    hKey, lpValueName, dwType, lpData, cbData = __reg_setvalex_args(params)
 
     s_hKey = ql.os.handle_manager.get(hKey).obj
     # this is done so the print_function would print the correct value
@@ -172,8 +203,7 @@ def __RegSetValueEx(ql: Qiling, address: int, params, wstring: bool):
     return ERROR_SUCCESS
 
 def __RegDeleteKey(ql: Qiling, address: int, params):
-    hKey = params["hKey"]
-    lpSubKey = params["lpSubKey"]
+    hKey, lpSubKey = __reg_delkey_args(params)
 
     s_hKey = ql.os.handle_manager.get(hKey).obj
     params["hKey"] = s_hKey
@@ -183,8 +213,7 @@ def __RegDeleteKey(ql: Qiling, address: int, params):
     return ERROR_SUCCESS
 
 def __RegDeleteValue(ql: Qiling, address: int, params):
-    hKey = params["hKey"]
-    lpValueName = params["lpValueName"]
+    hKey, lpValueName = __reg_delvalue_args(params)
 
     s_hKey = ql.os.handle_manager.get(hKey).obj
     params["hKey"] = s_hKey
@@ -193,103 +222,73 @@ def __RegDeleteValue(ql: Qiling, address: int, params):
 
     return ERROR_SUCCESS
 
-# LSTATUS RegOpenKeyExA(
-#   HKEY   hKey,
-#   LPCSTR lpSubKey,
-#   DWORD  ulOptions,
-#   REGSAM samDesired,
-#   PHKEY  phkResult
-# );
-@winsdkapi(cc=STDCALL, params={
-    'hKey'      : HKEY,
-    'lpSubKey'  : LPCSTR,
-    'ulOptions' : DWORD,
-    'samDesired': REGSAM,
-    'phkResult' : PHKEY
-})
-def hook_RegOpenKeyExA(ql: Qiling, address: int, params):
-    return __RegOpenKey(ql, address, params)
-
-# LSTATUS RegOpenKeyExW(
+# LSTATUS RegOpenKey{A,W}(
 #   HKEY    hKey,
-#   LPCWSTR lpSubKey,
-#   DWORD   ulOptions,
-#   REGSAM  samDesired,
+#   LPCSTR  lpSubKey,     -- LPCWSTR for the W variant
 #   PHKEY   phkResult
 # );
-@winsdkapi(cc=STDCALL, params={
-    'hKey'      : HKEY,
-    'lpSubKey'  : LPCWSTR,
-    'ulOptions' : DWORD,
-    'samDesired': REGSAM,
-    'phkResult' : PHKEY
-})
-def hook_RegOpenKeyExW(ql: Qiling, address: int, params):
-    return __RegOpenKey(ql, address, params)
-
-# LSTATUS RegOpenKeyW(
-#   HKEY    hKey,
-#   LPCWSTR lpSubKey,
-#   PHKEY   phkResult
-# );
-@winsdkapi(cc=STDCALL, params={
-    'hKey'      : HKEY,
-    'lpSubKey'  : LPCWSTR,
-    'phkResult' : PHKEY
-})
-def hook_RegOpenKeyW(ql: Qiling, address: int, params):
-    return __RegOpenKey(ql, address, params)
-
-# LSTATUS RegOpenKeyA(
+#
+# LSTATUS RegOpenKeyEx{A,W}(
 #   HKEY    hKey,
-#   LPCSTR lpSubKey,
+#   LPCSTR  lpSubKey,     -- LPCWSTR for the W variant
+#   DWORD   ulOptions,
+#   REGSAM  samDesired,
 #   PHKEY   phkResult
 # );
-@winsdkapi(cc=STDCALL, params={
-    'hKey'      : HKEY,
-    'lpSubKey'  : LPCSTR,
-    'phkResult' : PHKEY
-})
-def hook_RegOpenKeyA(ql: Qiling, address: int, params):
-    return __RegOpenKey(ql, address, params)
-
-# LSTATUS RegQueryValueExA(
-#   HKEY    hKey,
-#   LPCSTR  lpValueName,
-#   LPDWORD lpReserved,
-#   LPDWORD lpType,
-#   LPBYTE  lpData,
-#   LPDWORD lpcbData
-# );
-@winsdkapi(cc=STDCALL, params={
-    'hKey'        : HKEY,
-    'lpValueName' : LPCSTR,
-    'lpReserved'  : LPDWORD,
-    'lpType'      : LPDWORD,
-    'lpData'      : LPBYTE,
-    'lpcbData'    : LPDWORD
-})
-def hook_RegQueryValueExA(ql: Qiling, address: int, params):
-    return __RegQueryValue(ql, address, params, wstring=False)
-
-# LSTATUS RegQueryValueExW(
+#
+# all four variants share the same implementation and differ only in their
+# parameters signature, so their hooks are generated out of one table
+for __name, __params in (
+    ('hook_RegOpenKeyA', {
+        'hKey'      : HKEY,
+        'lpSubKey'  : LPCSTR,
+        'phkResult' : PHKEY
+    }),
+    ('hook_RegOpenKeyW', {
+        'hKey'      : HKEY,
+        'lpSubKey'  : LPCWSTR,
+        'phkResult' : PHKEY
+    }),
+    ('hook_RegOpenKeyExA', {
+        'hKey'      : HKEY,
+        'lpSubKey'  : LPCSTR,
+        'ulOptions' : DWORD,
+        'samDesired': REGSAM,
+        'phkResult' : PHKEY
+    }),
+    ('hook_RegOpenKeyExW', {
+        'hKey'      : HKEY,
+        'lpSubKey'  : LPCWSTR,
+        'ulOptions' : DWORD,
+        'samDesired': REGSAM,
+        'phkResult' : PHKEY
+    })
+):
+    globals()[__name] = __make_reg_hook(__RegOpenKey, __name, __params)
+
+# LSTATUS RegQueryValueEx{A,W}(
 #   HKEY    hKey,
-#   LPCWSTR lpValueName,
+#   LPCSTR  lpValueName,  -- LPCWSTR for the W variant
 #   LPDWORD lpReserved,
 #   LPDWORD lpType,
 #   LPBYTE  lpData,
 #   LPDWORD lpcbData
 # );
-@winsdkapi(cc=STDCALL, params={
-    'hKey'        : HKEY,
-    'lpValueName' : LPCWSTR,
-    'lpReserved'  : LPDWORD,
-    'lpType'      : LPDWORD,
-    'lpData'      : LPBYTE,
-    'lpcbData'    : LPDWORD
-})
-def hook_RegQueryValueExW(ql: Qiling, address: int, params):
-    return __RegQueryValue(ql, address, params, wstring=True)
+#
+# the wstring flag is fixed per variant, so it is bound in advance rather
+# than dispatched on every call
+for __name, __lpstr_type, __wstring in (
+    ('hook_RegQueryValueExA', LPCSTR,  False),
+    ('hook_RegQueryValueExW', LPCWSTR, True)
+):
+    globals()[__name] = __make_reg_hook(__RegQueryValue, __name, {
+        'hKey'        : HKEY,
+        'lpValueName' : __lpstr_type,
+        'lpReserved'  : LPDWORD,
+        'lpType'      : LPDWORD,
+        'lpData'      : LPBYTE,
+        'lpcbData'    : LPDWORD
+    }, wstring=__wstring)
 
 # LSTATUS RegCloseKey(
 #   HKEY hKey
@@ -355,70 +354,45 @@ def hook_RegCreateKeyExW(ql: Qiling, address: int, params):
     # fall back to the simple implementation
     return __RegCreateKey(ql, address, params)
 
-# LSTATUS RegSetValueA(
+# LSTATUS RegSetValue{A,W}(
 #   HKEY   hKey,
-#   LPCSTR lpSubKey,
+#   LPCSTR lpSubKey,  -- LPCWSTR for the W variant
 #   DWORD  dwType,
-#   LPCSTR lpData,
+#   LPCSTR lpData,    -- LPCWSTR for the W variant
 #   DWORD  cbData
 # );
-@winsdkapi(cc=STDCALL, params={
-    'hKey'     : HKEY,
-    'lpSubKey' : LPCSTR,
-    'dwType'   : DWORD,
-    'lpData'   : LPCSTR,
-    'cbData'   : DWORD
-})
-def hook_RegSetValueA(ql: Qiling, address: int, params):
-    return __RegSetValue(ql, address, params, wstring=False)
-
-@winsdkapi(cc=STDCALL, params={
-    'hKey'     : HKEY,
-    'lpSubKey' : LPCWSTR,
-    'dwType'   : DWORD,
-    'lpData'   : LPCWSTR,
-    'cbData'   : DWORD
-})
-def hook_RegSetValueW(ql: Qiling, address: int, params):
-    return __RegSetValue(ql, address, params, wstring=False)
-
-# LSTATUS RegSetValueExA(
-#   HKEY       hKey,
-#   LPCSTR     lpValueName,
-#   DWORD      Reserved,
-#   DWORD      dwType,
-#   const BYTE *lpData,
-#   DWORD      cbData
-# );
-@winsdkapi(cc=STDCALL, params={
-    'hKey'        : HKEY,
-    'lpValueName' : LPCSTR,
-    'Reserved'    : DWORD,
-    'dwType'      : DWORD,
-    'lpData'      : LPBYTE,
-    'cbData'      : DWORD
-})
-def hook_RegSetValueExA(ql: Qiling, address: int, params):
-    return __RegSetValueEx(ql, address, params, wstring=False)
-
-# LSTATUS RegSetValueExW(
+for __name, __lpstr_type, __wstring in (
+    ('hook_RegSetValueA', LPCSTR,  False),
+    ('hook_RegSetValueW', LPCWSTR, False)
+):
+    globals()[__name] = __make_reg_hook(__RegSetValue, __name, {
+        'hKey'     : HKEY,
+        'lpSubKey' : __lpstr_type,
+        'dwType'   : DWORD,
+        'lpData'   : __lpstr_type,
+        'cbData'   : DWORD
+    }, wstring=__wstring)
+
+# LSTATUS RegSetValueEx{A,W}(
 #   HKEY       hKey,
-#   LPCWSTR    lpValueName,
+#   LPCSTR     lpValueName,  -- LPCWSTR for the W variant
 #   DWORD      Reserved,
 #   DWORD      dwType,
 #   const BYTE *lpData,
 #   DWORD      cbData
 # );
-@winsdkapi(cc=STDCALL, params={
-    'hKey'        : HKEY,
-    'lpValueName' : LPCWSTR,
-    'Reserved'    : DWORD,
-    'dwType'      : DWORD,
-    'lpData'      : LPBYTE,
-    'cbData'      : DWORD
-})
-def hook_RegSetValueExW(ql: Qiling, address: int, params):
-    return __RegSetValueEx(ql, address, params, wstring=True)
+for __name, __lpstr_type, __wstring in (
+    ('hook_RegSetValueExA', LPCSTR,  False),
+    ('hook_RegSetValueExW', LPCWSTR, True)
+):
+    globals()[__name] = __make_reg_hook(__RegSetValueEx, __name, {
+        'hKey'        : HKEY,
+        'lpValueName' : __lpstr_type,
+        'Reserved'    : DWORD,
+        'dwType'      : DWORD,
+        'lpData'      : LPBYTE,
+        'cbData'      : DWORD
+    }, wstring=__wstring)
 
 # LSTATUS RegDeleteKeyA(
 #   HKEY   hKey,
@@ -521,7 +495,7 @@ def hook_GetSidSubAuthorityCount(ql: Qiling, address: int, params):
     # SID address is used as its handle id
     sid = ql.os.handle_manager.get(pSid).obj
 
-    return pSid + sid.offsetof('SubAuthorityCount')
+    return pSid + sid.SubAuthorityCount_off
 
 # PDWORD GetSidSubAuthority(
 #   PSID  pSid,
@@ -538,7 +512,7 @@ def hook_GetSidSubAuthority(ql: Qiling, address: int, params):
     # SID address is used as its handle id
     sid = ql.os.handle_manager.get(pSid).obj
 
-    return pSid + sid.offsetof('SubAuthority') + (4 * nSubAuthority)
+    return pSid + sid.SubAuthority_off + (4 * nSubAuthority)
 
 # LSTATUS RegEnumValueA(
 #   HKEY    hKey,
@@ -559,7 +533,7 @@ def hook_GetSidSubAuthority(ql: Qiling, address: int, params):
     'lpType'         : LPDWORD,
     'lpData'         : LPBYTE,
     'lpcbData'       : LPDWORD
-})
+}, stub_return=ERROR_NO_MORE_ITEMS)
 def hook_RegEnumValueA(ql: Qiling, address: int, params):
     return ERROR_NO_MORE_ITEMS
 
@@ -578,11 +552,13 @@ def hook_OpenSCManagerA(ql: Qiling, address: int, params):
     lpDatabaseName = params["lpDatabaseName"]
 
     sc_handle_name = "sc_%s_%s" % (lpMachineName, lpDatabaseName)
-    new_handle = ql.os.handle_manager.search(sc_handle_name)
+
+    hm = ql.os.handle_manager
+    new_handle = hm.search(sc_handle_name)
 
     if new_handle is None:
         new_handle = Handle(name=sc_handle_name)
-        ql.os.handle_manager.append(new_handle)
+        hm.append(new_handle)
 
     return new_handle.id
 
@@ -701,7 +677,7 @@ def hook_StartServiceA(ql: Qiling, address: int, params):
 })
 def hook_AllocateAndInitializeSid(ql: Qiling, address: int, params):
     count = params["nSubAuthorityCount"]
-    subauths = tuple(params[f'nSubAuthority{i}'] for i in range(count))
+    subauths = tuple(params[key] for key in __subauth_keys[:count])
 
     sid_struct = make_sid(auth_count=len(subauths))
     sid_addr = ql.os.heap.alloc(sid_struct.sizeof())
@@ -713,7 +689,14 @@ def hook_AllocateAndInitializeSid(ql: Qiling, address: int, params):
         SubAuthority = subauths
     )
 
-    sid_obj.save_to(ql.mem, sid_addr)
+    # well-known SIDs have their serialized form precomputed, which saves
+    # re-serializing the structure on every allocation
+    cached = __WELL_KNOWN_SID_BYTES.get(subauths)
+
+    if cached is None:
+        sid_obj.save_to(ql.mem, sid_addr)
+    else:
+        ql.mem.write(sid_addr, cached)
 
     handle = Handle(obj=sid_obj, id=sid_addr)
     ql.os.handle_manager.append(handle)
@@ -723,7 +706,7 @@ def hook_AllocateAndInitializeSid(ql: Qiling, address: int, params):
 
     return 1
 
-def __create_default_sid(ql: Qiling, subauths: Tuple[int, ...]):
+def __create_default_sid(subauths: Tuple[int, ...]):
     sid_struct = make_sid(auth_count=len(subauths))
 
     sid_obj = sid_struct(
@@ -735,57 +718,35 @@ def __create_default_sid(ql: Qiling, subauths: Tuple[int, ...]):
 
     return sid_obj
 
-def singleton(func: Callable):
-    """A decorator for functions that produce singleton objects.
-
-    When a decorated function is called for the first time, its
-    singleton object will be created. The same object will be returned
-    on all consequent calls regardless of the passed arguments (if any).
-    """
-
-    __singleton = None
-
-    def wrapper(*args, **kwargs):
-        nonlocal __singleton
-
-        if __singleton is None:
-            __singleton = func(*args, **kwargs)
-
-        return __singleton
-
-    return wrapper
-
-# Administrators (S-1-5-32-544)
-@singleton
-def __admin_sid(ql: Qiling):
-    # nSubAuthority0 = SECURITY_BUILTIN_DOMAIN_RID[0x20]
-    # nSubAuthority1 = DOMAIN_ALIAS_RID_ADMINS[0x220]
-
-    return __create_default_sid(ql, (0x20, 0x220))
-
-# All Users (S-1-5-32-545)
-@singleton
-def __users_sid(ql: Qiling):
-    # nSubAuthority0 = SECURITY_BUILTIN_DOMAIN_RID[0x20]
-    # nSubAuthority1 = DOMAIN_ALIAS_RID_USERS[0x221]
-
-    return __create_default_sid(ql, (0x20, 0x221))
+# serialized forms of the well-known SIDs, precomputed at import time
+__WELL_KNOWN_SID_BYTES = {
+    subauths: bytes(__create_default_sid(subauths)) for subauths in (
+        (0x20, 0x220),  # Administrators (S-1-5-32-544)
+        (0x20, 0x221),  # Users          (S-1-5-32-545)
+        (0x20, 0x222),  # Guests         (S-1-5-32-546)
+        (0x20, 0x223)   # Power Users    (S-1-5-32-547)
+    )
+}
 
-# All Users (S-1-5-32-546)
-@singleton
-def __guests_sid(ql: Qiling):
-    # nSubAuthority0 = SECURITY_BUILTIN_DOMAIN_RID[0x20]
-    # nSubAuthority1 = DOMAIN_ALIAS_RID_GUESTS[0x222]
+def __member_of_admins(ql: Qiling) -> bool:
+    return ql.os.profile["SYSTEM"]["permission"] == "root"
 
-    return __create_default_sid(ql, (0x20, 0x222))
+def __member_of_users(ql: Qiling) -> bool:
+    # FIXME: is this true for all tokens? probably not...
+    return True
 
-# Power Users (S-1-5-32-547)
-@singleton
-def __powerusers_sid(ql: Qiling):
-    # nSubAuthority0 = SECURITY_BUILTIN_DOMAIN_RID[0x20]
-    # nSubAuthority1 = DOMAIN_ALIAS_RID_POWER_USERS[0x223]
+def __member_of_guests(ql: Qiling) -> bool:
+    return False
 
-    return __create_default_sid(ql, (0x20, 0x223))
+# membership policy for each well-known group, keyed by the serialized form
+# of its SID: matching the packed bytes boils down to a single C-level memcmp
+# rather than a field-by-field structure comparison
+__GROUP_POLICY = {
+    __WELL_KNOWN_SID_BYTES[(0x20, 0x220)]: __member_of_admins,  # Administrators
+    __WELL_KNOWN_SID_BYTES[(0x20, 0x221)]: __member_of_users,   # Users
+    __WELL_KNOWN_SID_BYTES[(0x20, 0x222)]: __member_of_guests,  # Guests
+    __WELL_KNOWN_SID_BYTES[(0x20, 0x223)]: __member_of_admins   # Power Users; for now, treat them as admins
+}
 
 
 # BOOL WINAPI CheckTokenMembership(
@@ -807,19 +768,12 @@ def hook_CheckTokenMembership(ql: Qiling, address: int, params):
 
     # If TokenHandle is NULL, CheckTokenMembership uses the impersonation token of the calling thread.
     if not TokenHandle:
-        # For now, treat power users as admins
-        if __admin_sid(ql) == sid or __powerusers_sid(ql) == sid:
-            IsMember = ql.os.profile["SYSTEM"]["permission"] == "root"
-
-        elif __users_sid(ql) == sid:
-            # FIXME: is this true for all tokens? probably not...
-            IsMember = True
+        policy = __GROUP_POLICY.get(bytes(sid))
 
-        elif __guests_sid(ql) == sid:
-            IsMember = False
-
-        else:
+        if policy is None:
             raise NotImplementedError
+
+        IsMember = policy(ql)
     else:
         raise NotImplementedError
 
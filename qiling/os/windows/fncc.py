@@ -4,7 +4,7 @@
 #
 
 from functools import wraps
-from typing import Any, Mapping
+from typing import Any, Mapping, Optional
 
 from qiling import Qiling
 from qiling.const import QL_INTERCEPT
@@ -14,16 +14,24 @@ STDCALL = 1
 CDECL   = 2
 MS64    = 3
 
-def winsdkapi(cc: int, params: Mapping[str, Any] = {}, passthru: bool = False):
+def winsdkapi(cc: int, params: Mapping[str, Any] = {}, passthru: bool = False, stub_return: Optional[int] = None):
     def decorator(func):
         @wraps(func)
         def wrapper(ql: Qiling, pc: int, api_name: str):
-            ql.os.fcall = ql.os.fcall_select(cc)
+            os = ql.os
+            os.fcall = os.fcall_select(cc)
 
-            onenter = ql.os.user_defined_api[QL_INTERCEPT.ENTER].get(api_name)
-            onexit = ql.os.user_defined_api[QL_INTERCEPT.EXIT].get(api_name)
+            user_api = os.user_defined_api
+            onenter = user_api[QL_INTERCEPT.ENTER].get(api_name)
+            onexit = user_api[QL_INTERCEPT.EXIT].get(api_name)
 
-            return ql.os.call(pc, func, params, onenter, onexit, passthru=passthru)
+            # hooks that unconditionally return a constant may skip parameters
+            # resolution, as long as the user did not intercept them. the stack
+            # frame is still unwound according to the calling convention
+            if stub_return is not None and onenter is None and onexit is None:
+                return os.call_stub(pc, func.__name__, params, stub_return)
+
+            return os.call(pc, func, params, onenter, onexit, passthru=passthru)
 
         return wrapper
 
@@ -8,6 +8,19 @@ from typing import Any, MutableMapping, Optional
 
 from qiling.os.windows.const import STD_ERROR_HANDLE, STD_INPUT_HANDLE, STD_OUTPUT_HANDLE
 
+# registry hive root keys and their reserved handle ids
+HKEY_ROOTS = (
+    (0x80000000, 'HKEY_CLASSES_ROOT'),
+    (0x80000001, 'HKEY_CURRENT_USER'),
+    (0x80000002, 'HKEY_LOCAL_MACHINE'),
+    (0x80000003, 'HKEY_USERS'),
+    (0x80000004, 'HKEY_PERFORMANCE_DATA'),
+    (0x80000005, 'HKEY_CURRENT_CONFIG'),
+    (0x80000007, 'HKEY_CURRENT_USER_LOCAL_SETTINGS'),
+    (0x80000060, 'HKEY_PERFORMANCE_NLSTEXT'),
+    (0x80000050, 'HKEY_PERFORMANCE_TEXT')
+)
+
 class Handle:
     ID = 0xa0000000
 
@@ -20,6 +33,9 @@ class Handle:
         self.obj = obj
         self.name = name
         self.permissions = permissions
+        # name is effectively immutable post-construction, so this check may
+        # be resolved here once rather than on every use
+        self.is_hkey = name is not None and name.startswith('HKEY')
 
     # overload "=="
     def __eq__(self, other: 'Handle'):
@@ -41,27 +57,20 @@ class HandleManager:
         self.append(HandleManager.STDERR)
 
         # registry hives
-        self.append(Handle(id=0x80000000, name='HKEY_CLASSES_ROOT'))
-        self.append(Handle(id=0x80000001, name='HKEY_CURRENT_USER'))
-        self.append(Handle(id=0x80000002, name='HKEY_LOCAL_MACHINE'))
-        self.append(Handle(id=0x80000003, name='HKEY_USERS'))
-        self.append(Handle(id=0x80000004, name='HKEY_PERFORMANCE_DATA'))
-        self.append(Handle(id=0x80000005, name='HKEY_CURRENT_CONFIG'))
-        self.append(Handle(id=0x80000007, name='HKEY_CURRENT_USER_LOCAL_SETTINGS'))
-        self.append(Handle(id=0x80000060, name='HKEY_PERFORMANCE_NLSTEXT'))
-        self.append(Handle(id=0x80000050, name='HKEY_PERFORMANCE_TEXT'))
+        for hkey_id, hkey_name in HKEY_ROOTS:
+            self.append(Handle(id=hkey_id, name=hkey_name))
 
     def append(self, handle: Handle) -> None:
         self.handles[handle.id] = handle
 
     def get(self, id: int) -> Optional[Handle]:
-        return self.handles.get(id, None)
+        # handle ids are sparse: auto-assigned ids grow from Handle.ID, hive
+        # roots use reserved 0x8000xxxx values and SID handles are keyed by
+        # their heap address. a dict probe is the fitting lookup here
+        return self.handles.get(id)
 
     def delete(self, id: int) -> None:
-        key = self.get(id)
-
-        if key is not None:
-            del self.handles[id]
+        self.handles.pop(id, None)
 
     def search(self, name: str) -> Optional[Handle]:
         return next((handle for handle in self.handles.values() if handle.name == name), None)
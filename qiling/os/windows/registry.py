@@ -7,7 +7,7 @@ import json
 import os
 
 from Registry import Registry
-from typing import Any, MutableMapping, Optional, Tuple, Union
+from typing import Any, Mapping, MutableMapping, Optional, Tuple, Union
 
 from qiling import Qiling
 from qiling.os.windows.const import REG_TYPES
@@ -191,6 +191,24 @@ class RegistryManager:
         except json.decoder.JSONDecodeError:
             raise QlErrorJsonDecode("Windows registry JSON decode error")
 
+        # cached profile registry section; fetching it once here saves a
+        # configparser proxy lookup on every registry access
+        self.regprofile = ql.profile['REGISTRY']
+
+        # case-folded view of the profile registry keys, mapping each folded
+        # key back to its original spelling. the profile is fully loaded by
+        # the time the registry manager is created, so this is built once at
+        # startup rather than on every registry access
+        self._profile_keys_cf: Mapping[str, str] = {key.casefold(): key for key in self.regprofile}
+
+    @property
+    def profile_keys_cf(self) -> Mapping[str, str]:
+        """Case-folded view of the profile registry keys, mapping each folded
+        key name to its original spelling.
+        """
+
+        return self._profile_keys_cf
+
     def exists(self, key: str) -> bool:
         self.access(key)
 
@@ -1224,6 +1224,11 @@ def make_sid(auth_count: int):
             # since SID structure is not padded, we can simply memcmp the instances
             return memoryview(self).cast('B') == memoryview(other).cast('B')
 
+    # commonly accessed field offsets, resolved once at type creation time so
+    # hooks do not have to go through a name-keyed offsetof lookup per call
+    SID.SubAuthorityCount_off = SID.offsetof('SubAuthorityCount')
+    SID.SubAuthority_off = SID.offsetof('SubAuthority')
+
     return SID
 
 